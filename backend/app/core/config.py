@@ -1,4 +1,5 @@
-from typing import List
+from functools import lru_cache
+from typing import FrozenSet
 import os
 from dotenv import load_dotenv
 
@@ -23,12 +24,13 @@ class Settings:
     SUPABASE_API_KEY: str = os.getenv("SUPABASE_API_KEY")
     SCRAPE_INTERVAL_HOURS: int = int(os.getenv("SCRAPE_INTERVAL_HOURS", 1))
     
-    # CORS Settings
-    BACKEND_CORS_ORIGINS: List[str] = [
+    # CORS Settings - frozenset for O(1) membership checks; materialize with
+    # list(...) where an ordered sequence is required (e.g. CORSMiddleware)
+    BACKEND_CORS_ORIGINS: FrozenSet[str] = frozenset({
         "http://localhost:3000",
         "http://localhost:3001",
         "https://bet-graph.vercel.app",
-    ]
+    })
     
     # Database Settings
     DATABASE_URL: str = "sqlite:///./app.db"
@@ -44,5 +46,16 @@ class Settings:
         case_sensitive = True
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the cached Settings instance.
+
+    Constructing Settings re-reads every environment variable; caching the
+    factory means tests and per-request callers share one instance instead
+    of rebuilding it each time.
+    """
+    return Settings()
+
+
+settings = get_settings()
 
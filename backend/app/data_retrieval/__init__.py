@@ -0,0 +1,8 @@
+"""
+Data retrieval package - Polymarket scraping and Supabase import.
+ScrapeTracker is re-exported here as the single canonical implementation.
+"""
+
+from .scrape_tracker import ScrapeTracker
+
+__all__ = ["ScrapeTracker"]
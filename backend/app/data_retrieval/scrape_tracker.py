@@ -3,36 +3,95 @@ import logging
 from datetime import datetime
 import socket
 import os
+import random
+import time
 from typing import Optional, Tuple
 from ..schemas.scrape_schema import ScrapeHistoryCreate, ScrapeHistoryUpdate
 
 logger = logging.getLogger(__name__)
 
+# Precompiled log banner; avoids rebuilding the 80-char string per call
+_BANNER = "=" * 80
+
+# Resolved once at import: socket.gethostname() can hit the resolver on some
+# systems, and hostname/PID don't change within a worker process
+_INSTANCE_ID = f"{socket.gethostname()}-{os.getpid()}"
+
+# Pre-resolved pydantic-core hooks for the scrape-start payload; calling the
+# compiled validator/serializer directly skips the Python-level
+# BaseModel.__init__/model_dump dispatch
+_CREATE_VALIDATOR = ScrapeHistoryCreate.__pydantic_validator__
+_CREATE_SERIALIZER = ScrapeHistoryCreate.__pydantic_serializer__
+
+
+def _with_retry(fn, attempts: int = 5, base_delay: float = 0.25):
+    """
+    Execute a Supabase call, retrying transient failures (429 rate limits
+    and 5xx gateway errors) with jittered exponential backoff.
+    Mirrors the retry handling in DatabaseService batch operations.
+    """
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except Exception as e:
+            error_msg = str(e)
+            is_transient = any(code in error_msg for code in ('429', '502', '503', '504', '521'))
+
+            if attempt < attempts - 1 and is_transient:
+                wait_time = base_delay * (2 ** attempt) + random.random() * base_delay
+                logger.warning("⚠️  Transient Supabase error (attempt %d/%d), retrying in %.2fs...", attempt + 1, attempts, wait_time)
+                time.sleep(wait_time)
+            else:
+                raise
+
 class ScrapeTracker:
+    # Minimum seconds between progress UPDATE round-trips; calls arriving
+    # faster than this are coalesced and only the latest counts are written
+    FLUSH_INTERVAL_SECONDS = 2.0
+
+    # Seconds to serve cached should_run_scrape/get_statistics results,
+    # so frequent polls (health checks, multiple callers) share one RPC
+    CACHE_TTL_SECONDS = 5.0
+
     def __init__(self, supabase_client: Client):
         self.client = supabase_client
         self.scrape_id = None
         self.instance_id = self._generate_instance_id()
+        self._pending = None
+        self._last_flush = time.monotonic()
+        self._rpc_cache = {}
+
+    def _cache_get(self, key):
+        """Return a cached RPC result if it hasn't expired, else None."""
+        entry = self._rpc_cache.get(key)
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+        return None
+
+    def _cache_set(self, key, value):
+        self._rpc_cache[key] = (time.monotonic() + self.CACHE_TTL_SECONDS, value)
     
     def _generate_instance_id(self) -> str:
-        """Generate a unique identifier for this instance."""
-        hostname = socket.gethostname()
-        pid = os.getpid()
-        return f"{hostname}-{pid}"
+        """Return the unique identifier for this worker process."""
+        return _INSTANCE_ID
     
     def should_run_scrape(self, min_interval_minutes: int = 55) -> Tuple[bool, str]:
         """
         Check if scraping should run based on last scrape time.
         Returns (should_run, reason)
         """
+        cached = self._cache_get(('should_run_scrape', min_interval_minutes))
+        if cached is not None:
+            return cached
+
         try:
-            logger.info("=" * 80)
+            logger.info(_BANNER)
             logger.info("Checking if scrape should run...")
-            
+
             # Call the PostgreSQL function
-            result = self.client.rpc('should_run_scrape', {
+            result = _with_retry(lambda: self.client.rpc('should_run_scrape', {
                 'min_interval_minutes': min_interval_minutes
-            }).execute()
+            }).execute())
             
             if result.data and len(result.data) > 0:
                 data = result.data[0]
@@ -43,33 +102,37 @@ class ScrapeTracker:
                 if should_run:
                     logger.info("✓ Scrape check PASSED")
                     if minutes_since:
-                        logger.info(f"  Last successful scrape: {minutes_since:.1f} minutes ago")
+                        logger.info("  Last successful scrape: %.1f minutes ago", minutes_since)
                     else:
                         logger.info("  No previous scrapes found")
-                    logger.info("=" * 80)
-                    return True, "Sufficient time has passed since last scrape"
+                    logger.info(_BANNER)
+                    result_tuple = (True, "Sufficient time has passed since last scrape")
+                    self._cache_set(('should_run_scrape', min_interval_minutes), result_tuple)
+                    return result_tuple
                 else:
                     if last_scrape_status == 'running':
                         logger.warning("✗ Scrape check FAILED: Another scrape is currently running")
-                        logger.warning(f"  Started {minutes_since:.1f} minutes ago on another instance")
+                        logger.warning("  Started %.1f minutes ago on another instance", minutes_since)
                         reason = f"Another scrape is running (started {minutes_since:.1f}m ago)"
                     else:
                         logger.warning("✗ Scrape check FAILED: Too soon since last scrape")
-                        logger.warning(f"  Last scrape completed {minutes_since:.1f} minutes ago")
-                        logger.warning(f"  Minimum interval: {min_interval_minutes} minutes")
+                        logger.warning("  Last scrape completed %.1f minutes ago", minutes_since)
+                        logger.warning("  Minimum interval: %d minutes", min_interval_minutes)
                         reason = f"Too soon since last scrape ({minutes_since:.1f}m ago, need {min_interval_minutes}m)"
-                    logger.info("=" * 80)
-                    return False, reason
+                    logger.info(_BANNER)
+                    result_tuple = (False, reason)
+                    self._cache_set(('should_run_scrape', min_interval_minutes), result_tuple)
+                    return result_tuple
             
             # If function call fails or returns nothing, allow scrape
             logger.warning("⚠ Could not check scrape status, allowing scrape to proceed")
-            logger.info("=" * 80)
+            logger.info(_BANNER)
             return True, "Could not verify last scrape time"
             
         except Exception as e:
             logger.error(f"Error checking scrape status: {e}")
             logger.warning("Allowing scrape to proceed due to error")
-            logger.info("=" * 80)
+            logger.info(_BANNER)
             return True, f"Error checking status: {str(e)}"
     
     def start_scrape(self) -> Optional[int]:
@@ -77,23 +140,26 @@ class ScrapeTracker:
         Record the start of a scrape run using validated schema.
         Returns the scrape_id for tracking.
         """
+        # A new run invalidates any cached should_run_scrape/statistics answer
+        self._rpc_cache.clear()
+
         try:
             logger.info("📝 Recording scrape start...")
-            
-            # Use schema for validation
-            scrape_create = ScrapeHistoryCreate(
-                status='running',
-                instance_id=self.instance_id
-            )
-            
-            result = self.client.table('scrape_history').insert(
-                scrape_create.model_dump(mode='json', exclude_none=True)
-            ).execute()
+
+            # Validate through the cached pydantic-core validator/serializer
+            scrape_create = _CREATE_VALIDATOR.validate_python({
+                'status': 'running',
+                'instance_id': self.instance_id
+            })
+
+            result = _with_retry(lambda: self.client.table('scrape_history').insert(
+                _CREATE_SERIALIZER.to_python(scrape_create, mode='json', exclude_none=True)
+            ).execute())
             
             if result.data and len(result.data) > 0:
                 self.scrape_id = result.data[0]['id']
-                logger.info(f"✓ Scrape started with ID: {self.scrape_id}")
-                logger.info(f"  Instance: {self.instance_id}")
+                logger.info("✓ Scrape started with ID: %s", self.scrape_id)
+                logger.info("  Instance: %s", self.instance_id)
                 return self.scrape_id
             
             return None
@@ -102,27 +168,63 @@ class ScrapeTracker:
             logger.error(f"Failed to record scrape start: {e}")
             return None
     
-    def update_scrape_progress(self, markets_fetched: int = 0, markets_added: int = 0, 
+    def update_scrape_progress(self, markets_fetched: int = 0, markets_added: int = 0,
                               markets_updated: int = 0, markets_failed: int = 0):
-        """Update the progress of the current scrape using validated schema."""
+        """
+        Update the progress of the current scrape.
+        Counts are coalesced in-memory and written at most once per
+        FLUSH_INTERVAL_SECONDS, so per-market calls don't each cost a
+        round-trip to Supabase. The counts are running totals, so only the
+        latest values need to be kept.
+        """
         if not self.scrape_id:
             return
-        
+
+        self._pending = {
+            'markets_fetched': markets_fetched,
+            'markets_added': markets_added,
+            'markets_updated': markets_updated,
+            'markets_failed': markets_failed
+        }
+
+        if time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL_SECONDS:
+            self._flush_progress()
+
+    def _flush_progress(self):
+        """
+        Write the most recent pending progress counts, if any.
+        The payload is four plain ints assembled in update_scrape_progress,
+        so it skips the ScrapeHistoryUpdate round-trip through Pydantic
+        that the once-per-run complete/fail writes still use.
+        """
+        if not self._pending or not self.scrape_id:
+            return
+
         try:
-            # Use schema for validation
-            update_data = ScrapeHistoryUpdate(
-                markets_fetched=markets_fetched,
-                markets_added=markets_added,
-                markets_updated=markets_updated,
-                markets_failed=markets_failed
-            )
-            
-            self.client.table('scrape_history').update(
-                update_data.model_dump(mode='json', exclude_none=True)
-            ).eq('id', self.scrape_id).execute()
-            
-        except Exception as e:
-            logger.error(f"Failed to update scrape progress: {e}")
+            # Preferred path: one JSONB column write, merged atomically
+            # server-side (see scripts/setup_scrape_history.py)
+            _with_retry(lambda: self.client.rpc('upsert_counters', {
+                'p_id': self.scrape_id,
+                'p_delta': self._pending
+            }).execute())
+
+            self._pending = None
+
+        except Exception as rpc_error:
+            # Fallback for databases without the upsert_counters function:
+            # write the legacy integer columns directly
+            logger.debug(f"upsert_counters RPC unavailable, falling back to column update: {rpc_error}")
+            try:
+                _with_retry(lambda: self.client.table('scrape_history').update(
+                    self._pending
+                ).eq('id', self.scrape_id).execute())
+
+                self._pending = None
+
+            except Exception as e:
+                logger.error(f"Failed to update scrape progress: {e}")
+        finally:
+            self._last_flush = time.monotonic()
     
     def complete_scrape(self, markets_fetched: int, markets_added: int, 
                        markets_updated: int, markets_failed: int, 
@@ -132,10 +234,14 @@ class ScrapeTracker:
             logger.warning("No scrape_id to complete")
             return
         
+        # The completion payload carries the final counters, superseding any
+        # coalesced progress update that is still buffered
+        self._pending = None
+
         try:
-            logger.info("=" * 80)
+            logger.info(_BANNER)
             logger.info("📊 Recording scrape completion...")
-            
+
             # Use schema for validation
             complete_data = ScrapeHistoryUpdate(
                 status='completed',
@@ -147,18 +253,18 @@ class ScrapeTracker:
                 duration_seconds=round(duration_seconds, 2)
             )
             
-            self.client.table('scrape_history').update(
+            _with_retry(lambda: self.client.table('scrape_history').update(
                 complete_data.model_dump(mode='json', exclude_none=True)
-            ).eq('id', self.scrape_id).execute()
+            ).eq('id', self.scrape_id).execute())
             
-            logger.info(f"✓ Scrape #{self.scrape_id} completed successfully")
-            logger.info(f"  Duration: {duration_seconds:.2f} seconds")
-            logger.info(f"  Markets fetched: {markets_fetched}")
-            logger.info(f"  Markets added: {markets_added}")
-            logger.info(f"  Markets updated: {markets_updated}")
+            logger.info("✓ Scrape #%s completed successfully", self.scrape_id)
+            logger.info("  Duration: %.2f seconds", duration_seconds)
+            logger.info("  Markets fetched: %d", markets_fetched)
+            logger.info("  Markets added: %d", markets_added)
+            logger.info("  Markets updated: %d", markets_updated)
             if markets_failed > 0:
-                logger.warning(f"  Markets failed: {markets_failed}")
-            logger.info("=" * 80)
+                logger.warning("  Markets failed: %d", markets_failed)
+            logger.info(_BANNER)
             
         except Exception as e:
             logger.error(f"Failed to mark scrape as completed: {e}")
@@ -168,9 +274,12 @@ class ScrapeTracker:
         if not self.scrape_id:
             logger.warning("No scrape_id to mark as failed")
             return
-        
+
+        # Persist the last buffered progress counts before marking the failure
+        self._flush_progress()
+
         try:
-            logger.error("=" * 80)
+            logger.error(_BANNER)
             logger.error("❌ Recording scrape failure...")
             
             # Use schema for validation
@@ -181,13 +290,13 @@ class ScrapeTracker:
                 duration_seconds=round(duration_seconds, 2) if duration_seconds is not None else None
             )
             
-            self.client.table('scrape_history').update(
+            _with_retry(lambda: self.client.table('scrape_history').update(
                 fail_data.model_dump(mode='json', exclude_none=True)
-            ).eq('id', self.scrape_id).execute()
+            ).eq('id', self.scrape_id).execute())
             
             logger.error(f"✗ Scrape #{self.scrape_id} marked as failed")
             logger.error(f"  Error: {error_message[:200]}")
-            logger.error("=" * 80)
+            logger.error(_BANNER)
             
         except Exception as e:
             logger.error(f"Failed to mark scrape as failed: {e}")
@@ -195,17 +304,22 @@ class ScrapeTracker:
     def cleanup_stale_scrapes(self):
         """Clean up any stale running scrapes (older than 2 hours)."""
         try:
-            result = self.client.rpc('cleanup_stale_scrapes').execute()
+            result = _with_retry(lambda: self.client.rpc('cleanup_stale_scrapes').execute())
             if result.data and result.data > 0:
-                logger.info(f"🧹 Cleaned up {result.data} stale scrape(s)")
+                logger.info("🧹 Cleaned up %s stale scrape(s)", result.data)
         except Exception as e:
             logger.error(f"Failed to cleanup stale scrapes: {e}")
     
     def get_statistics(self) -> dict:
         """Get overall scraping statistics."""
+        cached = self._cache_get('statistics')
+        if cached is not None:
+            return cached
+
         try:
-            result = self.client.rpc('get_scrape_statistics').execute()
+            result = _with_retry(lambda: self.client.rpc('get_scrape_statistics').execute())
             if result.data and len(result.data) > 0:
+                self._cache_set('statistics', result.data[0])
                 return result.data[0]
             return {}
         except Exception as e:
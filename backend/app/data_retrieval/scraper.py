@@ -244,7 +244,15 @@ def scrape_and_store_markets(supabase_url: str, supabase_api_key: str):
                         
                         logger.info(f"  Calculating volatility for {len(markets_needing_volatility)} new markets...")
                         logger.info(f"  Using price change data from Gamma API (no rate limits!)")
-                        
+
+                        # Resolve all DB ids in one query instead of one
+                        # SELECT per market inside the loop
+                        id_response = supabase_client.table('markets').select('id, polymarket_id').in_(
+                            'polymarket_id',
+                            [m['polymarket_id'] for m in markets_needing_volatility]
+                        ).execute()
+                        market_id_by_polymarket = {row['polymarket_id']: row['id'] for row in id_response.data}
+
                         vol_success = 0
                         price_history_count = 0
                         proxy_count = 0
@@ -263,13 +271,11 @@ def scrape_and_store_markets(supabase_url: str, supabase_api_key: str):
                                 else:
                                     price_history_count += 1
                                 
-                                # Get market DB ID
-                                market_response = supabase_client.table('markets').select('id').eq('polymarket_id', polymarket_id).execute()
-                                if not market_response.data:
+                                # Get market DB ID from the batch lookup
+                                market_id = market_id_by_polymarket.get(polymarket_id)
+                                if market_id is None:
                                     continue
-                                
-                                market_id = market_response.data[0]['id']
-                                
+
                                 # Insert volatility
                                 insert_data = {
                                     'market_id': market_id,
@@ -298,11 +304,11 @@ def scrape_and_store_markets(supabase_url: str, supabase_api_key: str):
                         
                     finally:
                         await calculator.close()
-                
-                        # Run async function
-                        vol_success, price_history_count = asyncio.run(calculate_volatility_async())
-                        logger.info(f"✅ Calculated volatility for {vol_success} markets ({price_history_count} from real price changes)")
-                
+
+                # Run async function
+                vol_success, price_history_count = asyncio.run(calculate_volatility_async())
+                logger.info(f"✅ Calculated volatility for {vol_success} markets ({price_history_count} from real price changes)")
+
             except Exception as e:
                 logger.warning(f"⚠️  Volatility calculation failed (non-critical): {e}")
             
@@ -50,6 +50,12 @@ class SupabaseClient:
         CREATE INDEX IF NOT EXISTS idx_markets_is_active ON markets(is_active);
         CREATE INDEX IF NOT EXISTS idx_markets_end_date ON markets(end_date);
         CREATE INDEX IF NOT EXISTS idx_markets_polymarket_id ON markets(polymarket_id);
+
+        -- Composite index for the default list query: filter by is_active,
+        -- order by created_at DESC with a limit. Lets the planner satisfy
+        -- ORDER BY + LIMIT straight from the index instead of sorting.
+        CREATE INDEX IF NOT EXISTS idx_markets_active_created_at
+            ON markets(is_active, created_at DESC);
         """
         
         try:
@@ -1,9 +1,11 @@
 """
 Market Routes - API endpoints for market CRUD operations
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime
+import hashlib
 from app.schemas.market_schema import (
     Market,
     MarketCreate,
@@ -12,10 +14,40 @@ from app.schemas.market_schema import (
     MarketListResponse
 )
 from app.services.database_service import get_database_service
+from app.utils.json_response import ORJSONResponse, dumps
 
 router = APIRouter(prefix="/markets", tags=["Markets"])
 
 
+def _market_list_response(
+    markets: List[Market],
+    total: int,
+    page: int,
+    page_size: int,
+    next_cursor: Optional[int] = None
+) -> ORJSONResponse:
+    """
+    Build a MarketListResponse-shaped payload and serialize it with orjson
+    directly. Returning a Response instance skips jsonable_encoder and the
+    response-model re-validation, which dominate latency when the list is
+    large; the Market models were already validated by the service layer.
+    """
+    return ORJSONResponse({
+        "markets": [m.model_dump() for m in markets],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "pages": -(-total // page_size) if page_size > 0 else 0,
+        "next_cursor": next_cursor
+    })
+
+
+def _market_etag(market: Market) -> str:
+    """ETag for a single market, derived from its id and last update time."""
+    ts = market.updated_at.timestamp() if market.updated_at else 0
+    return hashlib.md5(f"{market.id}:{ts}".encode()).hexdigest()
+
+
 @router.post("/", response_model=MarketResponse, status_code=201)
 async def create_market(market_data: MarketCreate):
     """
@@ -44,9 +76,11 @@ async def create_market(market_data: MarketCreate):
 
 
 @router.get("/{market_id}", response_model=MarketResponse)
-async def get_market(market_id: int):
+async def get_market(market_id: int, request: Request, response: Response):
     """
     Get a market by its database ID.
+    Supports conditional GET: sends an ETag and answers 304 Not Modified
+    when the client already has the current version.
     """
     try:
         db = get_database_service()
@@ -55,6 +89,11 @@ async def get_market(market_id: int):
         if not market:
             raise HTTPException(status_code=404, detail="Market not found")
         
+        etag = _market_etag(market)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304)
+        
+        response.headers["ETag"] = etag
         return MarketResponse(market=market)
     except HTTPException:
         raise
@@ -63,9 +102,10 @@ async def get_market(market_id: int):
 
 
 @router.get("/polymarket/{polymarket_id}", response_model=MarketResponse)
-async def get_market_by_polymarket_id(polymarket_id: str):
+async def get_market_by_polymarket_id(polymarket_id: str, request: Request, response: Response):
     """
     Get a market by its Polymarket ID.
+    Supports conditional GET via ETag, same as the database-ID endpoint.
     """
     try:
         db = get_database_service()
@@ -74,6 +114,11 @@ async def get_market_by_polymarket_id(polymarket_id: str):
         if not market:
             raise HTTPException(status_code=404, detail="Market not found")
         
+        etag = _market_etag(market)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304)
+        
+        response.headers["ETag"] = etag
         return MarketResponse(market=market)
     except HTTPException:
         raise
@@ -87,31 +132,35 @@ async def get_markets(
     offset: int = Query(0, ge=0, description="Number of results to skip"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     order_by: str = Query("created_at", description="Field to order by"),
-    ascending: bool = Query(False, description="Sort order")
+    ascending: bool = Query(False, description="Sort order"),
+    after_id: Optional[int] = Query(None, ge=0, description="Keyset cursor: return markets with id greater than this")
 ):
     """
     Get a list of markets with pagination and filtering.
+
+    For deep pagination pass after_id (keyset) instead of offset: the
+    response's next_cursor feeds the next request and stays constant-cost
+    at any depth.
     """
     try:
         db = get_database_service()
-        
+
         markets = await db.get_markets(
             limit=limit,
             offset=offset,
             is_active=is_active,
             order_by=order_by,
-            ascending=ascending
+            ascending=ascending,
+            after_id=after_id
         )
-        
+
         total = await db.count_markets(is_active=is_active)
-        
+
         page = offset // limit if limit > 0 else 0
-        
-        return MarketListResponse(
-            markets=markets,
-            total=total,
-            page=page,
-            page_size=limit
+        next_cursor = markets[-1].id if after_id is not None and len(markets) == limit else None
+
+        return _market_list_response(
+            markets, total=total, page=page, page_size=limit, next_cursor=next_cursor
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -177,13 +226,8 @@ async def search_markets(
     try:
         db = get_database_service()
         markets = await db.search_markets(query=q, limit=limit)
-        
-        return MarketListResponse(
-            markets=markets,
-            total=len(markets),
-            page=0,
-            page_size=limit
-        )
+
+        return _market_list_response(markets, total=len(markets), page=0, page_size=limit)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -199,17 +243,46 @@ async def get_active_markets(
         db = get_database_service()
         markets = await db.get_active_markets(limit=limit)
         total = await db.count_markets(is_active=True)
-        
-        return MarketListResponse(
-            markets=markets,
-            total=total,
-            page=0,
-            page_size=limit
-        )
+
+        return _market_list_response(markets, total=total, page=0, page_size=limit)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/export/all")
+async def export_markets(
+    is_active: Optional[bool] = Query(None, description="Filter by active status"),
+    batch_size: int = Query(500, ge=1, le=2000, description="Rows fetched per database page")
+):
+    """
+    Stream all markets as one JSON document.
+
+    Rows are fetched and serialized one page at a time, so peak memory
+    stays flat regardless of table size and the first bytes go out as
+    soon as the first page arrives — unlike the list endpoint, which
+    materializes everything before encoding.
+    """
+    db = get_database_service()
+    total = await db.count_markets(is_active=is_active)
+
+    async def iter_markets_json():
+        yield b'{"total": ' + str(total).encode() + b', "markets": ['
+        first = True
+        offset = 0
+        while True:
+            markets = await db.get_markets(limit=batch_size, offset=offset, is_active=is_active)
+            for market in markets:
+                prefix = b'' if first else b','
+                first = False
+                yield prefix + dumps(market.model_dump())
+            if len(markets) < batch_size:
+                break
+            offset += batch_size
+        yield b']}'
+
+    return StreamingResponse(iter_markets_json(), media_type="application/json")
+
+
 @router.post("/batch/upsert")
 async def batch_upsert_markets(markets: List[MarketCreate]):
     """
@@ -1,9 +1,14 @@
-from pydantic import BaseModel, Field, computed_field
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 from typing import List, Optional
 from datetime import datetime
 
 class MarketBase(BaseModel):
     """Base schema for a market"""
+    # Markets are materialized by the thousand during scrapes and never
+    # mutated after construction; frozen instances make that explicit and
+    # skip the validate-on-assignment machinery
+    model_config = ConfigDict(frozen=True)
+
     polymarket_id: str = Field(..., description="Unique identifier from Polymarket")
     question: str = Field(..., description="Market question")
     description: Optional[str] = Field(None, description="Detailed market description")
@@ -50,8 +55,7 @@ class Market(MarketBase):
     volatility_data_points: Optional[int] = Field(None, description="Number of data points used in volatility calculation")
     volatility_calculated_at: Optional[datetime] = Field(None, description="When the volatility was last calculated")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(frozen=True, from_attributes=True)
 
 class MarketResponse(BaseModel):
     """Schema for API market response"""
@@ -63,4 +67,11 @@ class MarketListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[int] = Field(None, description="Pass as after_id to fetch the next keyset page")
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def pages(self) -> int:
+        """Total page count; -(-a // b) is ceil division without math.ceil."""
+        return -(-self.total // self.page_size) if self.page_size > 0 else 0
 
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 
@@ -20,6 +20,10 @@ class ScrapeHistoryCreate(BaseModel):
 
 class ScrapeHistoryUpdate(BaseModel):
     """Schema for updating a scrape history record"""
+    # Built fresh for every tracker write and only ever dumped, never
+    # mutated or fed unknown keys
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     status: Optional[str] = None
     completed_at: Optional[datetime] = None
     markets_fetched: Optional[int] = None
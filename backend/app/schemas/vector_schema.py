@@ -23,10 +23,24 @@ class VectorEmbedding(BaseModel):
     topics: Optional[List[dict]] = Field(None, description="AI-generated topics for the market")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Update timestamp")
-    
+
     class Config:
         from_attributes = True
 
+    @classmethod
+    def from_db_row(cls, row: dict) -> "VectorEmbedding":
+        """
+        Build an instance from a trusted Supabase row without validation.
+
+        Full validation walks every float of the embedding (1536+ elements
+        per row), which dominates bulk loads like get_all_embeddings.
+        model_construct skips that; the trade-off is that timestamp fields
+        keep the ISO strings the database returned instead of being parsed
+        into datetime, so only use this where the embedding and market_id
+        are what's consumed.
+        """
+        return cls.model_construct(**row)
+
 class VectorEmbeddingCreate(BaseModel):
     """Schema for creating a vector embedding"""
     market_id: int = Field(..., description="Market ID to create embedding for")
@@ -12,6 +12,57 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Select clause shared by every market read that joins volatility data;
+# the joined column list is fixed, so build the string once
+_MARKET_SELECT = (
+    '*, market_volatility!market_volatility_market_id_fkey'
+    '(real_volatility_24h, proxy_volatility_24h, calculation_method, data_points, calculated_at)'
+)
+
+# (Market field, market_volatility column) pairs flattened into each row
+_VOLATILITY_FIELDS = (
+    ('real_volatility_24h', 'real_volatility_24h'),
+    ('proxy_volatility_24h', 'proxy_volatility_24h'),
+    ('volatility_calculation_method', 'calculation_method'),
+    ('volatility_data_points', 'data_points'),
+    ('volatility_calculated_at', 'calculated_at'),
+)
+
+
+def _patch_dict(model) -> Dict[str, Any]:
+    """
+    Build an update payload from the fields explicitly set on a model.
+
+    Reads __pydantic_fields_set__ and the instance dict directly instead of
+    walking every field through model_dump; None values are dropped to keep
+    the old exclude_none behaviour (updates never null out columns).
+    """
+    values = model.__dict__
+    return {k: values[k] for k in model.__pydantic_fields_set__ if values[k] is not None}
+
+
+def _row_to_market(market_data: Dict[str, Any]) -> Market:
+    """
+    Build a Market from a joined markets row, flattening the nested
+    market_volatility payload. Supabase returns a dict for one-to-one
+    relationships and a list for one-to-many, so both shapes are handled.
+    """
+    market_dict = dict(market_data)
+    volatility = market_dict.pop('market_volatility', None)
+
+    vol_data = None
+    if volatility:
+        if isinstance(volatility, dict):
+            vol_data = volatility
+        elif isinstance(volatility, list) and len(volatility) > 0:
+            vol_data = volatility[0]
+
+    if vol_data and isinstance(vol_data, dict):
+        for market_key, vol_key in _VOLATILITY_FIELDS:
+            market_dict[market_key] = vol_data.get(vol_key)
+
+    return Market(**market_dict)
+
 
 class DatabaseService:
     """
@@ -44,16 +95,17 @@ class DatabaseService:
             Created Market object with id and timestamps
         """
         try:
+            # created_at/updated_at are filled server-side by DEFAULT NOW(),
+            # so the insert payload doesn't need client clock values
             data = market_data.model_dump()
-            data['created_at'] = datetime.utcnow().isoformat()
-            data['updated_at'] = datetime.utcnow().isoformat()
-            
+
             response = self.client.table('markets').insert(data).execute()
-            
+
             if response.data:
-                market_id = response.data[0]['id']
-                # Fetch the created market with volatility data
-                return await self.get_market_by_id(market_id)
+                # The insert already returns the row with its server-assigned
+                # id and timestamps, so the old refetch round-trip is not
+                # needed; a brand-new market has no volatility row to join
+                return _row_to_market(response.data[0])
             else:
                 raise Exception("Failed to create market: No data returned")
                 
@@ -74,32 +126,13 @@ class DatabaseService:
         """
         try:
             response = self.client.table('markets').select(
-                '*, market_volatility!market_volatility_market_id_fkey(real_volatility_24h, proxy_volatility_24h, calculation_method, data_points, calculated_at)'
+                _MARKET_SELECT
             ).eq('id', market_id).execute()
-            
+
             if response.data:
-                market_data = response.data[0]
-                market_dict = dict(market_data)
-                
-                # Extract and flatten volatility data
-                volatility = market_dict.pop('market_volatility', None)
-                vol_data = None
-                if volatility:
-                    if isinstance(volatility, dict):
-                        vol_data = volatility
-                    elif isinstance(volatility, list) and len(volatility) > 0:
-                        vol_data = volatility[0]
-                
-                if vol_data and isinstance(vol_data, dict):
-                    market_dict['real_volatility_24h'] = vol_data.get('real_volatility_24h')
-                    market_dict['proxy_volatility_24h'] = vol_data.get('proxy_volatility_24h')
-                    market_dict['volatility_calculation_method'] = vol_data.get('calculation_method')
-                    market_dict['volatility_data_points'] = vol_data.get('data_points')
-                    market_dict['volatility_calculated_at'] = vol_data.get('calculated_at')
-                
-                return Market(**market_dict)
+                return _row_to_market(response.data[0])
             return None
-            
+
         except Exception as e:
             logger.error(f"Error retrieving market {market_id}: {e}")
             raise
@@ -130,31 +163,10 @@ class DatabaseService:
             try:
                 # Supabase 'in' filter for batch retrieval with volatility join
                 response = self.client.table('markets').select(
-                    '*, market_volatility!market_volatility_market_id_fkey(real_volatility_24h, proxy_volatility_24h, calculation_method, data_points, calculated_at)'
+                    _MARKET_SELECT
                 ).in_('id', market_ids).execute()
-                
-                # Process the joined data
-                markets = []
-                for market_data in response.data:
-                    market_dict = dict(market_data)
-                    volatility = market_dict.pop('market_volatility', None)
-                    
-                    vol_data = None
-                    if volatility:
-                        if isinstance(volatility, dict):
-                            vol_data = volatility
-                        elif isinstance(volatility, list) and len(volatility) > 0:
-                            vol_data = volatility[0]
-                    
-                    if vol_data and isinstance(vol_data, dict):
-                        market_dict['real_volatility_24h'] = vol_data.get('real_volatility_24h')
-                        market_dict['proxy_volatility_24h'] = vol_data.get('proxy_volatility_24h')
-                        market_dict['volatility_calculation_method'] = vol_data.get('calculation_method')
-                        market_dict['volatility_data_points'] = vol_data.get('data_points')
-                        market_dict['volatility_calculated_at'] = vol_data.get('calculated_at')
-                    markets.append(Market(**market_dict))
-                
-                return markets
+
+                return [_row_to_market(market_data) for market_data in response.data]
                 
             except Exception as e:
                 error_msg = str(e)
@@ -181,30 +193,11 @@ class DatabaseService:
         """
         try:
             response = self.client.table('markets').select(
-                '*, market_volatility!market_volatility_market_id_fkey(real_volatility_24h, proxy_volatility_24h, calculation_method, data_points, calculated_at)'
+                _MARKET_SELECT
             ).eq('polymarket_id', polymarket_id).execute()
-            
+
             if response.data:
-                market_data = response.data[0]
-                market_dict = dict(market_data)
-                
-                # Extract and flatten volatility data
-                volatility = market_dict.pop('market_volatility', None)
-                vol_data = None
-                if volatility:
-                    if isinstance(volatility, dict):
-                        vol_data = volatility
-                    elif isinstance(volatility, list) and len(volatility) > 0:
-                        vol_data = volatility[0]
-                
-                if vol_data and isinstance(vol_data, dict):
-                    market_dict['real_volatility_24h'] = vol_data.get('real_volatility_24h')
-                    market_dict['proxy_volatility_24h'] = vol_data.get('proxy_volatility_24h')
-                    market_dict['volatility_calculation_method'] = vol_data.get('calculation_method')
-                    market_dict['volatility_data_points'] = vol_data.get('data_points')
-                    market_dict['volatility_calculated_at'] = vol_data.get('calculated_at')
-                
-                return Market(**market_dict)
+                return _row_to_market(response.data[0])
             return None
             
         except Exception as e:
@@ -217,39 +210,41 @@ class DatabaseService:
         offset: int = 0,
         is_active: Optional[bool] = None,
         order_by: str = 'created_at',
-        ascending: bool = False
+        ascending: bool = False,
+        after_id: Optional[int] = None
     ) -> List[Market]:
         """
         Retrieve multiple markets with filtering and pagination.
         Includes volatility scores via LEFT JOIN with market_volatility table.
-        
+
         Args:
             limit: Maximum number of markets to return
             offset: Number of markets to skip
             is_active: Filter by active status (None = all)
             order_by: Field to order by
             ascending: Sort order (False = descending)
-            
+            after_id: Keyset cursor; when set, returns markets with id greater
+                than this ordered by id, and offset/order_by are ignored
+
         Returns:
             List of Market objects with volatility data
         """
         try:
             # LEFT JOIN with market_volatility table to get volatility scores
             # Using the foreign key name to specify the relationship
-            query = self.client.table('markets').select(
-                '*, market_volatility!market_volatility_market_id_fkey(real_volatility_24h, proxy_volatility_24h, calculation_method, data_points, calculated_at)'
-            )
-            
+            query = self.client.table('markets').select(_MARKET_SELECT)
+
             # Apply filters
             if is_active is not None:
                 query = query.eq('is_active', is_active)
-            
-            # Apply ordering
-            query = query.order(order_by, desc=not ascending)
-            
-            # Apply pagination
-            query = query.range(offset, offset + limit - 1)
-            
+
+            if after_id is not None:
+                # Keyset pagination: constant cost at any page depth, unlike
+                # offset which scans and discards every skipped row
+                query = query.gt('id', after_id).order('id').limit(limit)
+            else:
+                query = query.order(order_by, desc=not ascending).range(offset, offset + limit - 1)
+
             response = query.execute()
             
             # Debug: log first market structure if available
@@ -262,29 +257,7 @@ class DatabaseService:
             markets = []
             for market_data in response.data:
                 try:
-                    # Make a copy to avoid modifying the original
-                    market_dict = dict(market_data)
-                    
-                    # Extract volatility data from nested structure
-                    volatility = market_dict.pop('market_volatility', None)
-                    
-                    # If volatility data exists, flatten it into market data
-                    # Supabase returns a dict for one-to-one relationships, list for one-to-many
-                    vol_data = None
-                    if volatility:
-                        if isinstance(volatility, dict):
-                            vol_data = volatility
-                        elif isinstance(volatility, list) and len(volatility) > 0:
-                            vol_data = volatility[0]
-                    
-                    if vol_data and isinstance(vol_data, dict):
-                        market_dict['real_volatility_24h'] = vol_data.get('real_volatility_24h')
-                        market_dict['proxy_volatility_24h'] = vol_data.get('proxy_volatility_24h')
-                        market_dict['volatility_calculation_method'] = vol_data.get('calculation_method')
-                        market_dict['volatility_data_points'] = vol_data.get('data_points')
-                        market_dict['volatility_calculated_at'] = vol_data.get('calculated_at')
-                    
-                    markets.append(Market(**market_dict))
+                    markets.append(_row_to_market(market_data))
                 except Exception as e:
                     logger.error(f"Error processing market data: {e}, market_data keys: {list(market_data.keys())}")
                     # Try to create market without volatility data as fallback
@@ -315,7 +288,7 @@ class DatabaseService:
             Updated Market object if found, None otherwise
         """
         try:
-            data = update_data.model_dump(exclude_none=True)
+            data = _patch_dict(update_data)
             data['updated_at'] = datetime.utcnow().isoformat()
             
             response = self.client.table('markets').update(data).eq('id', market_id).execute()
@@ -342,18 +315,21 @@ class DatabaseService:
         try:
             data = market_data.model_dump()
             data['updated_at'] = datetime.utcnow().isoformat()
-            
-            # Check if market exists
-            existing = await self.get_market_by_polymarket_id(market_data.polymarket_id)
-            
-            if existing:
-                # Update existing market
-                update_data = MarketUpdate(**data)
-                return await self.update_market(existing.id, update_data)
-            else:
-                # Create new market
-                return await self.create_market(market_data)
-                
+
+            # Single round-trip: PostgREST upsert is INSERT ... ON CONFLICT
+            # DO UPDATE ... RETURNING, replacing the old SELECT-then-
+            # update-or-create flow (up to four round-trips per market)
+            response = self.client.table('markets').upsert(
+                data,
+                on_conflict='polymarket_id'
+            ).execute()
+
+            if response.data:
+                # Returned row has no joined volatility data; callers that
+                # need it go through get_market_by_id
+                return Market(**response.data[0])
+            raise Exception("Failed to upsert market: No data returned")
+
         except Exception as e:
             logger.error(f"Error upserting market: {e}")
             raise
@@ -419,33 +395,12 @@ class DatabaseService:
         try:
             # Use ilike for case-insensitive partial match with volatility join
             response = self.client.table('markets').select(
-                '*, market_volatility!market_volatility_market_id_fkey(real_volatility_24h, proxy_volatility_24h, calculation_method, data_points, calculated_at)'
+                _MARKET_SELECT
             ).or_(
                 f"question.ilike.%{query}%,description.ilike.%{query}%"
             ).limit(limit).execute()
-            
-            # Process the joined data
-            markets = []
-            for market_data in response.data:
-                market_dict = dict(market_data)
-                volatility = market_dict.pop('market_volatility', None)
-                
-                vol_data = None
-                if volatility:
-                    if isinstance(volatility, dict):
-                        vol_data = volatility
-                    elif isinstance(volatility, list) and len(volatility) > 0:
-                        vol_data = volatility[0]
-                
-                if vol_data and isinstance(vol_data, dict):
-                    market_dict['real_volatility_24h'] = vol_data.get('real_volatility_24h')
-                    market_dict['proxy_volatility_24h'] = vol_data.get('proxy_volatility_24h')
-                    market_dict['volatility_calculation_method'] = vol_data.get('calculation_method')
-                    market_dict['volatility_data_points'] = vol_data.get('data_points')
-                    market_dict['volatility_calculated_at'] = vol_data.get('calculated_at')
-                markets.append(Market(**market_dict))
-            
-            return markets
+
+            return [_row_to_market(market_data) for market_data in response.data]
             
         except Exception as e:
             logger.error(f"Error searching markets: {e}")
@@ -471,35 +426,14 @@ class DatabaseService:
         """
         try:
             response = self.client.table('markets').select(
-                '*, market_volatility!market_volatility_market_id_fkey(real_volatility_24h, proxy_volatility_24h, calculation_method, data_points, calculated_at)'
+                _MARKET_SELECT
             ).gte(
                 'end_date', start_date.isoformat()
             ).lte(
                 'end_date', end_date.isoformat()
             ).limit(limit).execute()
-            
-            # Process the joined data
-            markets = []
-            for market_data in response.data:
-                market_dict = dict(market_data)
-                volatility = market_dict.pop('market_volatility', None)
-                
-                vol_data = None
-                if volatility:
-                    if isinstance(volatility, dict):
-                        vol_data = volatility
-                    elif isinstance(volatility, list) and len(volatility) > 0:
-                        vol_data = volatility[0]
-                
-                if vol_data and isinstance(vol_data, dict):
-                    market_dict['real_volatility_24h'] = vol_data.get('real_volatility_24h')
-                    market_dict['proxy_volatility_24h'] = vol_data.get('proxy_volatility_24h')
-                    market_dict['volatility_calculation_method'] = vol_data.get('calculation_method')
-                    market_dict['volatility_data_points'] = vol_data.get('data_points')
-                    market_dict['volatility_calculated_at'] = vol_data.get('calculated_at')
-                markets.append(Market(**market_dict))
-            
-            return markets
+
+            return [_row_to_market(market_data) for market_data in response.data]
             
         except Exception as e:
             logger.error(f"Error getting markets by date range: {e}")
@@ -545,10 +479,11 @@ class DatabaseService:
     async def store_embedding(self, market_id: int, embedding: List[float], topics: Optional[List[dict]] = None) -> VectorEmbedding:
         """Store a vector embedding for a market."""
         try:
+            # created_at is server-side (DEFAULT NOW()) and omitting it here
+            # also keeps an upsert from clobbering the original creation time
             data = {
                 'market_id': market_id,
                 'embedding': embedding,
-                'created_at': datetime.utcnow().isoformat(),
                 'updated_at': datetime.utcnow().isoformat()
             }
             
@@ -584,11 +519,35 @@ class DatabaseService:
         """Get all stored embeddings."""
         try:
             response = self.client.table('vector_embeddings').select('*').limit(limit).execute()
-            return [VectorEmbedding(**emb) for emb in response.data]
+            # Trusted DB rows: skip per-float validation of each embedding
+            return [VectorEmbedding.from_db_row(emb) for emb in response.data]
         except Exception as e:
             logger.error(f"Error getting embeddings: {e}")
             raise
     
+    async def get_embedding_vectors(self, limit: int = 100000) -> List[Dict[str, Any]]:
+        """
+        Get only (market_id, embedding) pairs for all stored embeddings.
+
+        Narrower than get_all_embeddings: skips id, topics and timestamps,
+        which the similarity matrix loader never reads — the topics JSON in
+        particular is a large share of each row's payload.
+
+        Args:
+            limit: Maximum number of rows to return
+
+        Returns:
+            List of {'market_id': ..., 'embedding': ...} dicts
+        """
+        try:
+            response = self.client.table('vector_embeddings').select(
+                'market_id, embedding'
+            ).limit(limit).execute()
+            return response.data
+        except Exception as e:
+            logger.error(f"Error getting embedding vectors: {e}")
+            raise
+
     async def get_embedding_market_ids(self, limit: int = 100000) -> List[int]:
         """
         Get only market IDs that have embeddings (much faster, no embedding vectors).
@@ -687,7 +646,6 @@ class DatabaseService:
                             record = {
                                 'market_id': item['market_id'],
                                 'embedding': item['embedding'],
-                                'created_at': now,
                                 'updated_at': now
                             }
                             if 'topics' in item and item['topics'] is not None:
@@ -760,29 +718,17 @@ class DatabaseService:
             ShortenedName object
         """
         try:
-            # Check if exists
-            existing = await self.get_shortened_name(market_id)
-            now = datetime.utcnow().isoformat()
-            
-            if existing:
-                # Update existing
-                data = {
-                    'market_id': market_id,
-                    'original_name': original_name,
-                    'shortened_name': shortened_name,
-                    'updated_at': now
-                }
-            else:
-                # Create new
-                data = {
-                    'market_id': market_id,
-                    'original_name': original_name,
-                    'shortened_name': shortened_name,
-                    'created_at': now,
-                    'updated_at': now
-                }
-            
-            # Upsert: update if exists, insert if not
+            # The upsert already handles both the insert and update case,
+            # so the old existence SELECT was a wasted round-trip per name;
+            # created_at stays server-side (DEFAULT NOW()) and untouched on
+            # conflict
+            data = {
+                'market_id': market_id,
+                'original_name': original_name,
+                'shortened_name': shortened_name,
+                'updated_at': datetime.utcnow().isoformat()
+            }
+
             response = self.client.table('shortened_names').upsert(
                 data,
                 on_conflict='market_id'
@@ -419,21 +419,45 @@ class RelationService:
         """
         created = 0
         failed = 0
-        
+
+        # Normalize rows once, then upsert in batches of 50 (same batch size
+        # as market imports) instead of one round-trip per relation
+        rows = []
         for relation in relations:
+            min_id = min(relation.market_id_1, relation.market_id_2)
+            max_id = max(relation.market_id_1, relation.market_id_2)
+            rows.append({
+                'market_id_1': min_id,
+                'market_id_2': max_id,
+                'similarity': relation.similarity,
+                'correlation': relation.correlation or 0.0,
+                'pressure': relation.pressure or 0.0
+            })
+
+        batch_size = 50
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i+batch_size]
             try:
-                await self.create_relation(
-                    relation.market_id_1,
-                    relation.market_id_2,
-                    relation.similarity,
-                    relation.correlation or 0.0,
-                    relation.pressure or 0.0
-                )
-                created += 1
+                self.db.client.table('market_relations').upsert(
+                    batch,
+                    on_conflict='market_id_1,market_id_2'
+                ).execute()
+                created += len(batch)
             except Exception as e:
-                failed += 1
-                logger.error(f"Failed to create relation: {e}")
-        
+                logger.error(f"Failed to upsert relation batch starting at {i}: {e}")
+                # Fall back to individual upserts so one bad row doesn't
+                # sink the whole batch
+                for row in batch:
+                    try:
+                        self.db.client.table('market_relations').upsert(
+                            row,
+                            on_conflict='market_id_1,market_id_2'
+                        ).execute()
+                        created += 1
+                    except Exception as e2:
+                        failed += 1
+                        logger.error(f"Failed to create relation: {e2}")
+
         return {
             "created": created,
             "failed": failed,
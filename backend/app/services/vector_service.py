@@ -5,6 +5,7 @@ from typing import List, Optional, Tuple
 from app.schemas.vector_schema import VectorEmbedding, Dataset
 from app.core.config import settings
 from app.utils.openai_service import get_openai_helper
+from app.utils.embeddings import normalize_rows, quantize_rows
 from app.services.database_service import get_database_service
 import logging
 import numpy as np
@@ -62,18 +63,92 @@ class BurstRateLimiter:
 
 class VectorService:
     """Service for vector operations using stored embeddings."""
-    
+
+    # Seconds to reuse the in-memory embedding matrix before reloading it
+    # from Supabase; similarity searches within the window skip the fetch
+    MATRIX_CACHE_TTL_SECONDS = 300.0
+
     def __init__(self):
         self._openai_helper = None
         self.db_service = get_database_service()
         self.rate_limiter = BurstRateLimiter(burst_size=1000, wait_seconds=65)  # 1000 RPM limit
-    
+        self._matrix_cache = None  # (expires_at, market_ids, int8 matrix, norms, scales)
+
     @property
     def openai_helper(self):
         """Lazy initialization of OpenAI helper - only when needed."""
         if self._openai_helper is None:
             self._openai_helper = get_openai_helper()
         return self._openai_helper
+
+    # ==================== EMBEDDING MATRIX CACHE ====================
+
+    def invalidate_matrix_cache(self):
+        """Drop the cached embedding matrix after embeddings change."""
+        self._matrix_cache = None
+
+    async def _get_embedding_matrix(self) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Return (market_ids, matrix, norms, scales) for all stored embeddings.
+
+        Loads once and caches for MATRIX_CACHE_TTL_SECONDS. The matrix is
+        held int8-quantized (one scale per row), a quarter of float32 and a
+        sixteenth of the Python-float lists it replaces; norms are the int8
+        row norms used for cosine similarity.
+        """
+        cache = self._matrix_cache
+        if cache is not None and time.monotonic() < cache[0]:
+            return cache[1], cache[2], cache[3], cache[4]
+
+        # Narrow select: only the two columns the matrix needs
+        rows = await self.db_service.get_embedding_vectors(limit=100000)
+        if not rows:
+            return None
+
+        market_ids = np.array([row['market_id'] for row in rows], dtype=np.int64)
+        matrix = np.array([row['embedding'] for row in rows], dtype=np.float32)
+        # Normalize before quantizing so the per-row scales are directly
+        # comparable for any consumer that dequantizes; cosine scoring
+        # itself is unaffected either way
+        quantized, scales = quantize_rows(normalize_rows(matrix))
+        norms = np.linalg.norm(quantized.astype(np.float32), axis=1)
+
+        self._matrix_cache = (
+            time.monotonic() + self.MATRIX_CACHE_TTL_SECONDS,
+            market_ids, quantized, norms, scales
+        )
+        return market_ids, quantized, norms, scales
+
+    @staticmethod
+    def _cosine_similarities(
+        matrix: np.ndarray,
+        norms: np.ndarray,
+        query_embedding: List[float]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Cosine similarities between the cached int8 matrix and a query.
+
+        The query is quantized to the same int8 grid and the dot products
+        run in integer arithmetic (query held as int32 so the accumulation
+        cannot overflow, without materializing an int32 copy of the
+        matrix). Per-row scales cancel out of cosine similarity, so they
+        are not needed here. Returns (similarities, valid-row mask), or
+        None for a zero query.
+        """
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_scale = np.abs(query).max() / 127.0 if query.size else 0.0
+        if query_scale == 0:
+            return None
+
+        query_i32 = np.round(query / query_scale).astype(np.int32)
+        query_norm = np.linalg.norm(query_i32)
+        if query_norm == 0:
+            return None
+
+        valid = norms > 0
+        similarities = np.zeros(len(norms), dtype=np.float32)
+        similarities[valid] = (matrix[valid] @ query_i32) / (norms[valid] * query_norm)
+        return similarities, valid
     
     # ==================== CREATE & STORE EMBEDDINGS ====================
     
@@ -114,8 +189,10 @@ class VectorService:
             topics_dict = [{"name": topic.name, "description": topic.description} for topic in topics] if topics else None
             
             # Store in database with topics
-            return await self.db_service.store_embedding(market_id, embedding, topics=topics_dict)
-            
+            stored = await self.db_service.store_embedding(market_id, embedding, topics=topics_dict)
+            self.invalidate_matrix_cache()
+            return stored
+
         except Exception as e:
             logger.error(f"Error creating embedding for market {market_id}: {e}")
             raise
@@ -276,7 +353,10 @@ class VectorService:
                 batch_time = time.time() - batch_start
                 logger.error(f"  ✗ Batch processing failed after {batch_time:.2f}s for batch {i}-{i+batch_size}: {e}")
                 failed += len(batch_ids)
-        
+
+        if created:
+            self.invalidate_matrix_cache()
+
         return {"created": created, "failed": failed, "total": len(market_ids)}
     
     # ==================== SIMILARITY SEARCH ====================
@@ -291,33 +371,19 @@ class VectorService:
         Returns list of (market_id, similarity_score).
         """
         try:
-            # Get all stored embeddings
-            all_embeddings = await self.db_service.get_all_embeddings()
-            
-            if not all_embeddings:
+            loaded = await self._get_embedding_matrix()
+            if loaded is None:
                 return []
-            
-            # Calculate similarities
-            query_array = np.array(query_embedding)
-            query_norm = np.linalg.norm(query_array)
-            
-            similarities = []
-            for emb in all_embeddings:
-                emb_array = np.array(emb.embedding)
-                emb_norm = np.linalg.norm(emb_array)
-                
-                if emb_norm == 0:
-                    continue
-                
-                # Cosine similarity
-                dot_product = np.dot(query_array, emb_array)
-                similarity = float(dot_product / (query_norm * emb_norm))
-                similarities.append((emb.market_id, similarity))
-            
-            # Sort and return top results
-            similarities.sort(key=lambda x: x[1], reverse=True)
-            return similarities[:limit]
-            
+            market_ids, matrix, norms, _scales = loaded
+
+            scored = self._cosine_similarities(matrix, norms, query_embedding)
+            if scored is None:
+                return []
+            similarities, valid = scored
+
+            top = np.argsort(similarities)[::-1][:limit]
+            return [(int(market_ids[i]), float(similarities[i])) for i in top if valid[i]]
+
         except Exception as e:
             logger.error(f"Error in similarity search: {e}")
             raise
@@ -383,36 +449,22 @@ class VectorService:
             List of (market_id, similarity_score) tuples above threshold
         """
         try:
-            # Get all stored embeddings
-            all_embeddings = await self.db_service.get_all_embeddings()
-            
-            if not all_embeddings:
+            loaded = await self._get_embedding_matrix()
+            if loaded is None:
                 return []
-            
-            # Calculate similarities
-            query_array = np.array(query_embedding)
-            query_norm = np.linalg.norm(query_array)
-            
-            results = []
-            for emb in all_embeddings:
-                emb_array = np.array(emb.embedding)
-                emb_norm = np.linalg.norm(emb_array)
-                
-                if emb_norm == 0:
-                    continue
-                
-                # Cosine similarity
-                dot_product = np.dot(query_array, emb_array)
-                similarity = float(dot_product / (query_norm * emb_norm))
-                
-                # Only include if above threshold
-                if similarity >= threshold:
-                    results.append((emb.market_id, similarity))
-            
-            # Sort by similarity (highest first)
-            results.sort(key=lambda x: x[1], reverse=True)
-            return results
-            
+            market_ids, matrix, norms, _scales = loaded
+
+            scored = self._cosine_similarities(matrix, norms, query_embedding)
+            if scored is None:
+                return []
+            similarities, valid = scored
+
+            # Only rows above threshold, sorted by similarity (highest first)
+            mask = valid & (similarities >= threshold)
+            idx = np.nonzero(mask)[0]
+            order = idx[np.argsort(similarities[idx])[::-1]]
+            return [(int(market_ids[i]), float(similarities[i])) for i in order]
+
         except Exception as e:
             logger.error(f"Error in proximity search: {e}")
             raise
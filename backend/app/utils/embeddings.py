@@ -0,0 +1,46 @@
+"""
+Embedding matrix helpers shared by the vector service.
+"""
+from typing import Tuple
+
+import numpy as np
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize each row of a 2-D float array in place-friendly numpy.
+
+    One broadcasted pass instead of a Python loop per vector; numpy's
+    reduction and division kernels vectorize to SIMD on their own. Zero
+    rows are left untouched rather than dividing by zero.
+
+    Args:
+        matrix: 2-D float array, one embedding per row
+
+    Returns:
+        The row-normalized matrix (float32)
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def quantize_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-row int8 quantization.
+
+    Each row is scaled by max(|row|) / 127 and rounded, so values span the
+    full int8 range. Retrieval workloads tolerate the precision loss, and
+    the matrix shrinks to a quarter of float32. Zero rows keep a scale of
+    0.0 and stay all-zero.
+
+    Args:
+        matrix: 2-D float array, one embedding per row
+
+    Returns:
+        Tuple of (int8 matrix, float32 per-row scales)
+    """
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    safe = np.where(scales > 0, scales, 1.0)
+    quantized = np.round(matrix / safe[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
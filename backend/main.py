@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import asyncio
 from contextlib import asynccontextmanager
 import logging
@@ -29,7 +30,11 @@ async def run_scheduler():
     while True:
         try:
             logger.info(f"\n⏰ Starting scheduled scrape cycle #{cycle}")
-            scrape_and_store_markets(settings.SUPABASE_URL, settings.SUPABASE_API_KEY)
+            # Run the synchronous scrape pipeline in a worker thread so the
+            # event loop stays free to serve API requests during the scrape
+            await asyncio.to_thread(
+                scrape_and_store_markets, settings.SUPABASE_URL, settings.SUPABASE_API_KEY
+            )
             logger.info(f"⏰ Next scrape in {settings.SCRAPE_INTERVAL_HOURS} hour(s) at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
             cycle += 1
         except Exception as e:
@@ -70,12 +75,13 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.BACKEND_CORS_ORIGINS,
+    allow_origins=list(settings.BACKEND_CORS_ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],